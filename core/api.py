@@ -6,6 +6,7 @@ from django.utils import timezone
 from django.db.models import Q, Count, Avg, Sum
 from .models import Source, Post, Analysis, Trade, TradingConfig, ApiResponse
 from .tasks import scrape_posts, analyze_post, execute_trade, close_trade_manually
+from .utils.cached_settings import invalidate_active_trading_config
 
 
 # Serializers
@@ -98,6 +99,8 @@ class TradingConfigViewSet(viewsets.ModelViewSet):
         """Activate a trading configuration and deactivate others."""
         config = self.get_object()
         TradingConfig.objects.update(is_active=False)
+        # Queryset updates skip post_save, so drop the cached active config explicitly
+        invalidate_active_trading_config()
         config.is_active = True
         config.save()
         return Response({"status": "Configuration activated"})
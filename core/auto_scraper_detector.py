@@ -253,7 +253,6 @@ class NewsSourceAutoDetector:
                 )
                 page = context.new_page()
                 page.goto(self.url, wait_until="domcontentloaded", timeout=20000)
-                page.wait_for_selector("body", timeout=10000)
 
                 article_selectors = [
                     'article', '.article', '[class*="article"]',
@@ -375,6 +375,19 @@ def get_managed_browser_page():
                 logger.warning(f"Error closing browser page: {e}")
 
 
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+def block_heavy_resources(page: Page):
+    """Abort image, font and media requests on a page that is only scraped for text."""
+    page.route(
+        "**/*",
+        lambda route: route.abort()
+        if route.request.resource_type in _BLOCKED_RESOURCE_TYPES
+        else route.continue_(),
+    )
+
+
 def get_browser_pool_stats() -> Dict[str, Any]:
     """Get browser pool statistics for monitoring"""
     try:
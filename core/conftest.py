@@ -0,0 +1,9 @@
+"""pytest hooks for the core test suite."""
+
+
+def pytest_collection_modifyitems(items):
+    """Expose Django @tag() labels as pytest markers so `-m "not slow"` works."""
+    for item in items:
+        tags = set(getattr(item.cls, "tags", ())) | set(getattr(item.obj, "tags", ()))
+        for name in tags:
+            item.add_marker(name)
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_post_published_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='analysis',
+            index=models.Index(fields=['created_at'], name='core_analys_created_b08fa9_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_analysis_core_analys_created_b08fa9_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['created_at'], name='core_post_created_2da706_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['created_at'], name='core_trade_created_c39ea6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trade',
+            index=models.Index(fields=['status'], name='core_trade_status_4007e8_idx'),
+        ),
+    ]
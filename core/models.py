@@ -209,6 +209,11 @@ class Post(models.Model):
     published_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
     def __str__(self):
         return f"Post from {self.source.name} at {self.created_at}"
 
@@ -246,6 +251,11 @@ class Analysis(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
     def __str__(self):
         return f"Analysis for {self.post.id}: {self.symbol} {self.direction}"
 
@@ -324,6 +334,10 @@ class Trade(models.Model):
                 name='unique_active_trade_per_symbol'
             )
         ]
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['status']),
+        ]
 
     def __str__(self):
         entry_price = self.entry_price if self.entry_price is not None else "N/A"
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import AlertSettings, TradingConfig
+from .utils.cached_settings import invalidate_active_trading_config, invalidate_alert_settings
+
+
+@receiver([post_save, post_delete], sender=AlertSettings)
+def invalidate_alert_settings_cache(sender, **kwargs):
+    invalidate_alert_settings()
+
+
+@receiver([post_save, post_delete], sender=TradingConfig)
+def invalidate_trading_config_cache(sender, **kwargs):
+    invalidate_active_trading_config()
@@ -5,7 +5,8 @@ import json
 import requests
 from bs4 import BeautifulSoup
 from celery import shared_task
-from core.browser_manager import get_managed_browser_page, get_browser_pool_stats
+from celery.exceptions import MaxRetriesExceededError
+from core.browser_manager import get_managed_browser_page, get_browser_pool_stats, cleanup_browser_pool, block_heavy_resources
 import asyncio
 
 from .models import Source, ApiResponse, Post, Analysis, Trade, TradingConfig, ActivityLog, AlertSettings, TwitterSession
@@ -13,9 +14,11 @@ from .twitter_scraper import scrape_twitter_profile
 
 # Health monitoring will be defined in this file for proper Celery registration
 from django.utils import timezone
+from django.db import connections
 from django.db.models import Q
 import logging
 import hashlib
+import threading
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -216,12 +219,12 @@ def send_dashboard_update(message_type, data):
             )
             logger.debug(f"Activity logged to database: {message_type}")
             try:
-                from .utils.telegram import send_telegram_message, is_alert_enabled
+                from .utils.telegram import is_alert_enabled
                 logger.debug("Alert dispatch gate check for type=%s", message_type)
                 if is_alert_enabled(message_type):
                     logger.info("Dispatching Telegram alert for type=%s", message_type)
-                    sent = send_telegram_message(message)
-                    logger.info("Telegram alert sent=%s type=%s", sent, message_type)
+                    send_telegram_message_task.delay(message)
+                    logger.info("Telegram alert queued type=%s", message_type)
                 else:
                     logger.info("Telegram alert disabled by settings for type=%s", message_type)
             except Exception as notify_error:
@@ -421,6 +424,33 @@ def _get_site_specific_selectors(url):
     return None
 
 
+# Walks the container selector (if it matches anything) or else each headline
+# selector in the given priority order, mirroring per-element inner_text/href
+# lookups: the element's own href, else its first descendant a[href].
+_EXTRACT_HEADLINE_CANDIDATES_JS = """
+([containerSelector, selectors]) => {
+    const query = (sel) => {
+        try { return Array.from(document.querySelectorAll(sel)); } catch (e) { return []; }
+    };
+    const describe = (el) => {
+        let title = (el.innerText || "").trim();
+        let href = el.getAttribute("href");
+        if (!href) {
+            const anchor = el.querySelector("a[href]");
+            href = anchor ? anchor.getAttribute("href") : null;
+            if (!title && anchor) title = (anchor.innerText || "").trim();
+        }
+        return [title, href];
+    };
+    if (containerSelector) {
+        const found = query(containerSelector);
+        if (found.length) return found.map(describe);
+    }
+    return selectors.flatMap((sel) => query(sel).map(describe));
+}
+"""
+
+
 def _scrape_with_browser(source):
     """Headless scraping using Playwright to collect headlines with limited infinite scroll."""
     # Playwright is mandatory; no env-based disable
@@ -484,6 +514,7 @@ def _scrape_with_browser(source):
             logger.warning(f"Twitter scraping fast-path failed; falling back to generic: {e}")
 
         site_config = _get_site_specific_selectors(source.url) or {}
+        # Priority order matters: inner anchors come before their headline wrappers
         headline_selectors = [
             "h1 a", "h2 a", "h3 a",
             "h1", "h2", "h3",
@@ -499,13 +530,10 @@ def _scrape_with_browser(source):
         with get_managed_browser_page() as page:
             # Set shorter timeouts to prevent hanging
             page.set_default_timeout(15000)
+            block_heavy_resources(page)
+            # <body> is guaranteed once DOMContentLoaded fires, so no extra wait is needed
             page.goto(source.url, wait_until="domcontentloaded", timeout=20000)
 
-            try:
-                page.wait_for_selector("body", timeout=10000)
-            except Exception:
-                pass
-
             last_height = 0
             for _ in range(max_scrolls):
                 page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
@@ -515,30 +543,17 @@ def _scrape_with_browser(source):
                     break
                 last_height = new_height
 
-            elements = []
-            container_selector = site_config.get("container")
-            if container_selector:
-                elements = page.query_selector_all(container_selector)
-            if not elements:
-                for sel in headline_selectors:
-                    found = page.query_selector_all(sel)
-                    if found:
-                        elements.extend(found)
+            # One round trip returns (title, href) for every match, selector by selector
+            raw_candidates = page.evaluate(
+                _EXTRACT_HEADLINE_CANDIDATES_JS,
+                [site_config.get("container"), headline_selectors],
+            )
 
             # Collect candidate articles in Playwright context (no DB operations)
             seen_links = set()
 
-            for el in elements:
+            for title, href in raw_candidates:
                 try:
-                    title = (el.inner_text() or "").strip()
-                    href = el.get_attribute("href")
-                    anchor = None
-                    if not href:
-                        anchor = el.query_selector("a[href]")
-                        href = anchor.get_attribute("href") if anchor else None
-                    if not title and anchor:
-                        title = (anchor.inner_text() or "").strip()
-
                     if not title or len(title) < min_title_len or not href:
                         continue
 
@@ -986,6 +1001,61 @@ def check_daily_trade_limit():
     return True, f"Trade limit OK ({today_trades}/{config.max_daily_trades})"
 
 
+def _get_scrape_max_workers() -> int:
+    try:
+        return max(1, int(os.getenv("SCRAPE_MAX_WORKERS", "4")))
+    except Exception:
+        return 4
+
+
+def _get_scrape_max_concurrent() -> int:
+    try:
+        return max(1, int(os.getenv("SCRAPE_MAX_CONCURRENT", "4")))
+    except Exception:
+        return 4
+
+
+# Process-wide cap on sources being scraped at once, across Celery worker threads
+# and scrape_posts fan-out threads; this bounds the browsers busy at any moment
+# without counting idle browsers parked in other threads' pools
+_scrape_slots = threading.BoundedSemaphore(_get_scrape_max_concurrent())
+
+
+def _scrape_and_report(source) -> bool:
+    """Scrape one source and push its completion/error status to the dashboard."""
+    try:
+        with _scrape_slots:
+            logger.info(f"Starting to scrape: {source.name}")
+            _scrape_source(source)
+        send_dashboard_update(
+            "scraper_status",
+            {"status": f"Completed scraping {source.name}", "source": source.name},
+        )
+        return True
+    except Exception as e:
+        logger.error(f"Error scraping source {source.name}: {e}")
+        send_dashboard_update(
+            "scraper_error",
+            {"source": source.name, "error": str(e), "method": "scraping"},
+        )
+        return False
+
+
+def _scrape_share_on_thread(sources):
+    """Scrape a share of the sources serially on a dedicated, short-lived thread.
+
+    The browser pool and DB connections are thread-local, so the thread's
+    Chromium is reused across its share and both are released once it is done.
+    cleanup_browser_pool() shuts the thread's pool for good, so this must be
+    the only share the thread ever runs.
+    """
+    try:
+        return [(source, _scrape_and_report(source)) for source in sources]
+    finally:
+        cleanup_browser_pool()
+        connections.close_all()
+
+
 @shared_task
 def scrape_posts(source_id=None, manual_test=False):
     """Scrape posts from all configured sources or a specific source."""
@@ -1047,22 +1117,31 @@ def scrape_posts(source_id=None, manual_test=False):
                 {"status": f"Started scraping {len(source_names)} sources", "sources": source_names},
             )
     
-    scraped_sources = []
-    for source in active_sources:
-        try:
-            logger.info(f"Starting to scrape: {source.name}")
-            _scrape_source(source)
-            scraped_sources.append(source.name)
-            send_dashboard_update(
-                "scraper_status",
-                {"status": f"Completed scraping {source.name}", "source": source.name},
-            )
-        except Exception as e:
-            logger.error(f"Error scraping source {source.name}: {e}")
-            send_dashboard_update(
-                "scraper_error",
-                {"source": source.name, "error": str(e), "method": "scraping"},
-            )
+    source_list = list(active_sources)
+    workers = min(_get_scrape_max_workers(), len(source_list))
+    if workers <= 1:
+        outcomes = [(source, _scrape_and_report(source)) for source in source_list]
+    else:
+        # Round-robin the sources into shares so page loads overlap. The task thread
+        # keeps the first share and its pooled browser; every other share gets its
+        # own thread, whose browser pool is torn down when the share finishes.
+        shares = [source_list[i::workers] for i in range(workers)]
+        share_outcomes = [[] for _ in shares]
+
+        def _run_share(index):
+            share_outcomes[index] = _scrape_share_on_thread(shares[index])
+
+        threads = [
+            threading.Thread(target=_run_share, args=(i,), name=f"scrape-share-{i}")
+            for i in range(1, workers)
+        ]
+        for thread in threads:
+            thread.start()
+        share_outcomes[0] = [(source, _scrape_and_report(source)) for source in shares[0]]
+        for thread in threads:
+            thread.join()
+        outcomes = [o for share in share_outcomes for o in share]
+    scraped_sources = [source.name for source, ok in outcomes if ok]
     
     # Log disabled sources being skipped (make DB-safe in async contexts)
     if _is_async_context():
@@ -1091,6 +1170,32 @@ def scrape_posts(source_id=None, manual_test=False):
     logger.info(f"Scraping finished. Processed: {', '.join(scraped_sources) if scraped_sources else 'None'}")
 
 
+def _find_reusable_analysis(post, config, max_age_hours=24):
+    """Return a recent successful analysis of the exact same headline, if any.
+
+    Wire stories are often republished verbatim by several sources; reusing the
+    earlier LLM response avoids paying for an identical OpenAI call. Analyses
+    older than the config's last edit are never reused, since the prompt or
+    model they were produced with may have changed.
+    """
+    cutoff = timezone.now() - timedelta(hours=max_age_hours)
+    if config is not None and config.updated_at and config.updated_at > cutoff:
+        cutoff = config.updated_at
+    return (
+        Analysis.objects.filter(
+            created_at__gte=cutoff,
+            trading_config_used=config,
+            post__content=post.content,
+            raw_llm_response__isnull=False,
+        )
+        .exclude(symbol="ERROR")
+        .exclude(post=post)
+        .only("post_id", "raw_llm_response")
+        .order_by("-created_at")
+        .first()
+    )
+
+
 @shared_task
 def analyze_post(post_id, manual_test=False):
     """Analyze a post with an LLM."""
@@ -1164,23 +1269,30 @@ Respond with a JSON object: { "symbol": "STOCK_SYMBOL", "direction": "buy", "con
 Direction can be 'buy', 'sell', or 'hold'. Confidence is a float between 0 and 1."""
         )
 
-        # Create OpenAI client with API key passed directly
-        client = openai.OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": (
-                    "You are given ONLY a news headline. Do not assume details beyond the headline.\n"
-                    "Headline:" + "\n\n" + post.content
-                )},
-            ],
-            response_format={"type": "json_object"},
-            temperature=getattr(config, "llm_temperature", 0.1) if config else 0.1,
-            max_tokens=getattr(config, "llm_max_tokens", 1000) if config else 1000,
-        )
+        reusable = _find_reusable_analysis(post, config)
+        if reusable is not None:
+            logger.info(
+                f"Post {post.id} has the same headline as post {reusable.post_id}; reusing its LLM response."
+            )
+            raw_response_content = reusable.raw_llm_response
+        else:
+            # Create OpenAI client with API key passed directly
+            client = openai.OpenAI(api_key=api_key)
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": (
+                        "You are given ONLY a news headline. Do not assume details beyond the headline.\n"
+                        "Headline:" + "\n\n" + post.content
+                    )},
+                ],
+                response_format={"type": "json_object"},
+                temperature=getattr(config, "llm_temperature", 0.1) if config else 0.1,
+                max_tokens=getattr(config, "llm_max_tokens", 1000) if config else 1000,
+            )
+            raw_response_content = response.choices[0].message.content
 
-        raw_response_content = response.choices[0].message.content
         llm_output = json.loads(raw_response_content)
 
         analysis = Analysis.objects.create(
@@ -2290,6 +2402,27 @@ def update_trade_status():
         logger.error(f"Error updating trade statuses: {e}")
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=10)
+def send_telegram_message_task(self, message):
+    """Deliver an alert from a worker so callers never wait on Telegram.
+
+    The message sits in the broker until a worker sends it; failed sends with
+    a configured bot are retried.
+    """
+    from .utils.telegram import get_telegram_config, send_telegram_message
+
+    if send_telegram_message(message):
+        return True
+    token, chat_id = get_telegram_config()
+    if not token or not chat_id:
+        return False
+    try:
+        raise self.retry()
+    except MaxRetriesExceededError:
+        logger.error("Telegram alert dropped after %s retries; message_len=%s", self.max_retries, len(message or ""))
+        return False
+
+
 @shared_task
 def send_bot_heartbeat():
     """Send a periodic heartbeat to Telegram when bot is enabled and alerts allow it.
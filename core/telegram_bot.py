@@ -317,7 +317,7 @@ Use the commands to control your trading bot remotely!
                 return
                 
             from core.models import TradingConfig
-            from core.utils.telegram import send_telegram_message
+            from core.tasks import send_telegram_message_task
             
             config = await sync_to_async(TradingConfig.objects.filter(is_active=True).first)()
             if not config:
@@ -333,7 +333,7 @@ Use the commands to control your trading bot remotely!
             await sync_to_async(config.save)(update_fields=['bot_enabled'])
             
             # Send notification via existing telegram utils
-            await sync_to_async(send_telegram_message)(
+            await sync_to_async(send_telegram_message_task.delay)(
                 "🟢 Trading bot has been ENABLED via Telegram command"
             )
             
@@ -351,7 +351,7 @@ Use the commands to control your trading bot remotely!
         
         try:
             from core.models import TradingConfig
-            from core.utils.telegram import send_telegram_message
+            from core.tasks import send_telegram_message_task
             
             config = await sync_to_async(TradingConfig.objects.filter(is_active=True).first)()
             if not config:
@@ -367,7 +367,7 @@ Use the commands to control your trading bot remotely!
             await sync_to_async(config.save)(update_fields=['bot_enabled'])
             
             # Send notification
-            await sync_to_async(send_telegram_message)(
+            await sync_to_async(send_telegram_message_task.delay)(
                 "🔴 Trading bot has been DISABLED via Telegram command"
             )
             
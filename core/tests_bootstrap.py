@@ -1,3 +1,6 @@
+from io import StringIO
+from unittest.mock import patch
+
 from django.test import TestCase
 from django.core.management import call_command
 from django.contrib.auth import get_user_model
@@ -5,7 +8,9 @@ from core.models import TradingConfig, AlertSettings, Source
 
 
 class BootstrapCommandTests(TestCase):
-    def test_bootstrap_full_setup_creates_everything(self):
+    # Beat schedule registration is its own command; only check that bootstrap delegates to it
+    @patch("core.management.commands.setup_periodic_tasks.Command.handle", return_value=None)
+    def test_bootstrap_full_setup_creates_everything(self, mock_setup_periodic_tasks):
         call_command(
             "bootstrap_full_setup",
             "--superuser",
@@ -15,6 +20,7 @@ class BootstrapCommandTests(TestCase):
             "--email",
             "admin@example.com",
             "--with-cnbc-latest",
+            stdout=StringIO(),
         )
 
         User = get_user_model()
@@ -34,5 +40,4 @@ class BootstrapCommandTests(TestCase):
         # CNBC source
         self.assertTrue(Source.objects.filter(url="https://www.cnbc.com/latest/").exists())
 
-
-
+        mock_setup_periodic_tasks.assert_called_once()
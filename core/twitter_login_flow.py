@@ -1,66 +1,104 @@
+import heapq
 import logging
+import os
 import threading
 import time
 import uuid
+from contextlib import ExitStack
 from datetime import datetime, timedelta
 
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+from playwright.sync_api import sync_playwright, Page, BrowserContext
+
+from .browser_manager import block_heavy_resources
 
 logger = logging.getLogger(__name__)
 
 
+def _close_quietly(close):
+    try:
+        close()
+    except Exception:
+        pass
+
+
 class _LoginAttempt:
-    def __init__(self, username: str, email: str, password: str, playwright, browser: Browser, context: BrowserContext, page: Page):
+    def __init__(self, username: str, email: str, password: str, resources: ExitStack, context: BrowserContext, page: Page):
         self.username = username
         self.email = email
         self.password = password
-        self.playwright = playwright
-        self.browser = browser
+        # Owns the playwright driver, browser and context; unwinds them in reverse order
+        self.resources = resources
         self.context = context
         self.page = page
         self.created_at = datetime.now()
         self.expires_at = self.created_at + timedelta(minutes=5)
 
     def close(self):
-        try:
-            if self.context:
-                self.context.close()
-        except Exception:
-            pass
-        try:
-            if self.browser:
-                self.browser.close()
-        except Exception:
-            pass
-        try:
-            if self.playwright:
-                self.playwright.stop()
-        except Exception:
-            pass
+        self.resources.close()
 
 
 _lock = threading.RLock()
 _attempts: dict[str, _LoginAttempt] = {}
+# (expires_at, token) min-heap; entries for tokens already removed are skipped when popped
+_expiry_heap: list[tuple[datetime, str]] = []
+# Each pending attempt keeps a whole Chromium alive; beyond this the oldest is dropped
+_MAX_PENDING_ATTEMPTS = 32
+# Failure screenshots/HTML dumps are opt-in; they are slow and can pile up during error bursts
+_DEBUG_ARTIFACTS = os.getenv("TWITTER_LOGIN_DEBUG") == "1"
+
+
+# Playwright's CSS engine accepts :has-text() inside a selector list, so one query covers all variants
+_CONSENT_BUTTON_SELECTOR = ", ".join([
+    'button:has-text("Accept all")',
+    'button:has-text("Accept all cookies")',
+    'button:has-text("Allow all cookies")',
+    'button:has-text("Accept")',
+    'div[role="button"]:has-text("Accept")',
+    'div[role="button"]:has-text("Allow all cookies")',
+    '[data-testid="confirmationSheetConfirm"]',
+])
+
+
+_LAUNCH_ARGS = (
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+)
+_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122 Safari/537.36"
+)
+
+_NEXT_BUTTON_SELECTOR = 'div[data-testid="ocfEnterTextNextButton"]'
+_NEXT_BUTTON_TEXT_SELECTOR = 'div[role="button"]:has-text("Next")'
+_LOGIN_BUTTON_SELECTOR = 'div[data-testid="LoginForm_Login_Button"]'
+_LOGIN_BUTTON_TEXT_SELECTOR = 'div[role="button"]:has-text("Log in")'
+_PASSWORD_INPUT_SELECTOR = 'input[name="password"], input[type="password"], input[data-testid="ocfEnterPasswordTextInput"]'
+_VERIFICATION_INPUT_SELECTOR = 'input[name="challenge_response"], input[autocomplete="one-time-code"]'
+_HOME_NAV_SELECTOR = 'a[href="/home"], [data-testid="AppTabBar_Home_Link"]'
+
+
+def _save_debug_artifacts(page, prefix: str):
+    """Dump a full-page screenshot and the page HTML to /tmp when TWITTER_LOGIN_DEBUG=1."""
+    if not _DEBUG_ARTIFACTS:
+        return
+    try:
+        ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+        page.screenshot(path=f"/tmp/{prefix}_{ts}.png", full_page=True)
+        with open(f"/tmp/{prefix}_{ts}.html", 'w', encoding='utf-8') as f:
+            f.write(page.content())
+        logger.info("[Twitter] saved debug artifacts to /tmp/%s_%s.(png|html)", prefix, ts)
+    except Exception:
+        pass
 
 
 def _dismiss_consent(page):
     """Best-effort dismissal of cookie/consent dialogs that can block inputs."""
     try:
-        selectors = [
-            'button:has-text("Accept all")',
-            'button:has-text("Accept all cookies")',
-            'button:has-text("Allow all cookies")',
-            'button:has-text("Accept")',
-            'div[role="button"]:has-text("Accept")',
-            'div[role="button"]:has-text("Allow all cookies")',
-            '[data-testid="confirmationSheetConfirm"]',
-        ]
-        for sel in selectors:
-            el = page.query_selector(sel)
-            if el:
-                el.click()
-                page.wait_for_timeout(500)
-                break
+        el = page.query_selector(_CONSENT_BUTTON_SELECTOR)
+        if el:
+            el.click()
+            page.wait_for_timeout(500)
     except Exception:
         pass
 
@@ -84,18 +122,41 @@ def _infer_identifier_required(page, input_element) -> str:
         pass
     return ''
 
+def _pop_oldest_attempt():
+    """Pop the soonest-expiring pending attempt off the heap; caller must hold _lock."""
+    while _expiry_heap:
+        _, token = heapq.heappop(_expiry_heap)
+        attempt = _attempts.pop(token, None)
+        if attempt is not None:
+            return attempt
+    return None
+
+
 def _cleanup_expired_attempts():
+    now = datetime.now()
+    expired = []
     with _lock:
-        to_delete = []
-        now = datetime.now()
-        for token, attempt in _attempts.items():
-            if attempt.expires_at <= now:
-                try:
-                    attempt.close()
-                finally:
-                    to_delete.append(token)
-        for token in to_delete:
-            _attempts.pop(token, None)
+        while _expiry_heap and _expiry_heap[0][0] <= now:
+            _, token = heapq.heappop(_expiry_heap)
+            attempt = _attempts.get(token)
+            # The token may already be gone (completed login) and never reused for a live attempt
+            if attempt is not None and attempt.expires_at <= now:
+                expired.append(_attempts.pop(token))
+    # Closing a browser is slow; do it without holding up other login requests
+    for attempt in expired:
+        attempt.close()
+
+
+def _store_attempt(token: str, attempt: _LoginAttempt):
+    """Register a pending attempt, evicting the oldest ones beyond _MAX_PENDING_ATTEMPTS."""
+    evicted = []
+    with _lock:
+        while len(_attempts) >= _MAX_PENDING_ATTEMPTS:
+            evicted.append(_pop_oldest_attempt())
+        _attempts[token] = attempt
+        heapq.heappush(_expiry_heap, (attempt.expires_at, token))
+    for old in evicted:
+        old.close()
 
 
 def start_login_flow(username: str, email: str, password: str) -> dict:
@@ -104,34 +165,31 @@ def start_login_flow(username: str, email: str, password: str) -> dict:
     Returns a dict with keys: success, token, verification_required, error
     """
     _cleanup_expired_attempts()
+    resources = ExitStack()
     try:
         pw = sync_playwright().start()
-        browser = pw.chromium.launch(headless=True, args=[
-            "--no-sandbox",
-            "--disable-dev-shm-usage",
-            "--disable-blink-features=AutomationControlled",
-        ])
-        context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122 Safari/537.36"
-            ),
-            viewport={"width": 1280, "height": 1600},
-        )
+        resources.callback(_close_quietly, pw.stop)
+        browser = pw.chromium.launch(headless=True, args=list(_LAUNCH_ARGS))
+        resources.callback(_close_quietly, browser.close)
+        context = browser.new_context(user_agent=_USER_AGENT, viewport={"width": 1280, "height": 1600})
+        resources.callback(_close_quietly, context.close)
         page = context.new_page()
+        page.set_default_timeout(15000)
+        page.set_default_navigation_timeout(25000)
+        block_heavy_resources(page)
 
         logger.info("[Twitter] Navigating to mobile login page")
         # Try the simpler mobile login flow first
         uname = (email or username).strip()
         mobile_ok = False
         try:
-            page.goto("https://mobile.twitter.com/login?hide_message=1", timeout=90000)
+            page.goto("https://mobile.twitter.com/login?hide_message=1", timeout=25000)
             _dismiss_consent(page)
-            page.wait_for_selector('input[name="session[username_or_email]"]', timeout=30000, state="visible")
+            page.wait_for_selector('input[name="session[username_or_email]"]', timeout=15000, state="visible")
             page.fill('input[name="session[username_or_email]"]', uname)
-            page.wait_for_selector('input[name="session[password]"]', timeout=30000, state="visible")
+            page.wait_for_selector('input[name="session[password]"]', timeout=15000, state="visible")
             page.fill('input[name="session[password]"]', password)
-            btn = page.query_selector('div[data-testid="LoginForm_Login_Button"]') or page.query_selector('button[type="submit"]')
+            btn = page.query_selector(_LOGIN_BUTTON_SELECTOR) or page.query_selector('button[type="submit"]')
             if btn:
                 btn.click()
             else:
@@ -144,10 +202,10 @@ def start_login_flow(username: str, email: str, password: str) -> dict:
         if not mobile_ok:
             logger.info("[Twitter] Mobile login unavailable; falling back to desktop flow")
             # Fallback to desktop login flow
-            page.goto("https://x.com/i/flow/login", timeout=90000)
+            page.goto("https://x.com/i/flow/login", timeout=25000)
             _dismiss_consent(page)
-            page.wait_for_selector('input[autocomplete="username"], input[name="text"]', timeout=40000, state="visible")
-            target_input = page.query_selector('input[autocomplete="username"]') or page.query_selector('input[name="text"]')
+            page.wait_for_selector('input[autocomplete="username"], input[name="text"]', timeout=15000, state="visible")
+            target_input = page.query_selector('input[autocomplete="username"], input[name="text"]')
             if target_input is None:
                 raise RuntimeError("Login username/email input not found")
             # Determine which identifier is being requested on this step
@@ -159,9 +217,9 @@ def start_login_flow(username: str, email: str, password: str) -> dict:
             # Next
             # Try multiple variants of Next (data-testid and text)
             btn = (
-                page.query_selector('div[data-testid="ocfEnterTextNextButton"]')
+                page.query_selector(_NEXT_BUTTON_SELECTOR)
                 or page.get_by_role("button", name="Next")
-                or page.query_selector('div[role="button"]:has-text("Next")')
+                or page.query_selector(_NEXT_BUTTON_TEXT_SELECTOR)
             )
             if btn:
                 btn.click()
@@ -169,7 +227,7 @@ def start_login_flow(username: str, email: str, password: str) -> dict:
                 target_input.press("Enter")
             # Optional extra identifier step
             try:
-                page.wait_for_selector('input[name="password"], input[type="password"], input[name="text"]', timeout=40000, state="visible")
+                page.wait_for_selector('input[name="password"], input[type="password"], input[name="text"]', timeout=15000, state="visible")
             except Exception:
                 pass
             extra_identifier = page.query_selector('input[name="text"]')
@@ -180,24 +238,24 @@ def start_login_flow(username: str, email: str, password: str) -> dict:
                     value2 = username
                 extra_identifier.fill(value2)
                 btn2 = (
-                    page.query_selector('div[data-testid="ocfEnterTextNextButton"]')
+                    page.query_selector(_NEXT_BUTTON_SELECTOR)
                     or page.get_by_role("button", name="Next")
-                    or page.query_selector('div[role="button"]:has-text("Next")')
+                    or page.query_selector(_NEXT_BUTTON_TEXT_SELECTOR)
                 )
                 if btn2:
                     btn2.click()
                 else:
                     extra_identifier.press("Enter")
             # Password field can have data-testid as well; try both
-            page.wait_for_selector('input[name="password"], input[type="password"], input[data-testid="ocfEnterPasswordTextInput"]', timeout=40000, state="visible")
-            pwd_input = page.query_selector('input[name="password"]') or page.query_selector('input[type="password"]') or page.query_selector('input[data-testid="ocfEnterPasswordTextInput"]')
+            page.wait_for_selector(_PASSWORD_INPUT_SELECTOR, timeout=15000, state="visible")
+            pwd_input = page.query_selector(_PASSWORD_INPUT_SELECTOR)
             if pwd_input is None:
                 raise RuntimeError("Password input not found")
             pwd_input.fill(password)
             login_button = (
-                page.query_selector('div[data-testid="LoginForm_Login_Button"]')
+                page.query_selector(_LOGIN_BUTTON_SELECTOR)
                 or page.get_by_role("button", name="Log in")
-                or page.query_selector('div[role="button"]:has-text("Log in")')
+                or page.query_selector(_LOGIN_BUTTON_TEXT_SELECTOR)
             )
             if login_button:
                 login_button.click()
@@ -205,50 +263,33 @@ def start_login_flow(username: str, email: str, password: str) -> dict:
                 pwd_input.press("Enter")
 
         # Determine if verification required
-        # Wait briefly; either we land in home/user or see verification input
-        page.wait_for_timeout(2500)
+        # A verification input, an identity challenge or the logged-in home nav appears; proceed on whichever is first
+        try:
+            page.wait_for_selector(
+                f'{_VERIFICATION_INPUT_SELECTOR}, input[name="text"], {_HOME_NAV_SELECTOR}', timeout=15000
+            )
+        except Exception:
+            pass
 
         # Check for code input presence (mobile and desktop patterns)
-        verification_input = (
-            page.query_selector('input[name="challenge_response"]') or
-            page.query_selector('input[autocomplete="one-time-code"]') or
-            page.query_selector('input[name="text"]')
-        )
+        verification_input = page.query_selector(f'{_VERIFICATION_INPUT_SELECTOR}, input[name="text"]')
         if verification_input is not None or "Enter verification code" in page.content():
             token = uuid.uuid4().hex
-            with _lock:
-                _attempts[token] = _LoginAttempt(username, email, password, pw, browser, context, page)
+            # The attempt takes over the open browser until the code arrives or it expires
+            _store_attempt(token, _LoginAttempt(username, email, password, resources.pop_all(), context, page))
             return {"success": True, "verification_required": True, "token": token}
 
         # Else assume success; capture storage state
         storage_state = context.storage_state()
         cookies = context.cookies()
-        try:
-            context.close()
-        finally:
-            try:
-                browser.close()
-            finally:
-                pw.stop()
+        resources.close()
         return {"success": True, "verification_required": False, "storage_state": storage_state, "cookies": cookies}
 
     except Exception as e:
         logger.error(f"Twitter login start failed: {e}")
-        try:
-            # Save debug artifacts
-            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-            if 'page' in locals() and page:
-                page.screenshot(path=f"/tmp/twitter_login_{ts}.png", full_page=True)
-                html = page.content()
-                with open(f"/tmp/twitter_login_{ts}.html", 'w', encoding='utf-8') as f:
-                    f.write(html)
-                logger.info("[Twitter] saved debug artifacts to /tmp/twitter_login_%s.(png|html)", ts)
-        except Exception:
-            pass
-        try:
-            pw.stop()
-        except Exception:
-            pass
+        if 'page' in locals() and page:
+            _save_debug_artifacts(page, "twitter_login")
+        resources.close()
         return {"success": False, "error": str(e)}
 
 
@@ -275,14 +316,17 @@ def complete_login_with_code(token: str, code: str) -> dict:
                     if i < len(inputs):
                         inputs[i].fill(ch)
         # Click Next/Submit
-        cont = page.get_by_role("button", name="Next") or page.query_selector('div[role="button"]:has-text("Next")')
+        cont = page.get_by_role("button", name="Next") or page.query_selector(_NEXT_BUTTON_TEXT_SELECTOR)
         if cont:
             cont.click()
         else:
             page.keyboard.press("Enter")
 
-        # Wait a bit for login to finish
-        page.wait_for_timeout(3000)
+        # Wait for the logged-in home nav rather than a fixed delay
+        try:
+            page.wait_for_selector(_HOME_NAV_SELECTOR, timeout=15000)
+        except Exception:
+            pass
 
         storage_state = attempt.context.storage_state()
         cookies = attempt.context.cookies()
@@ -296,15 +340,8 @@ def complete_login_with_code(token: str, code: str) -> dict:
 
     except Exception as e:
         logger.error(f"Twitter login verification failed: {e}")
-        try:
-            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-            if 'page' in locals() and page:
-                page.screenshot(path=f"/tmp/twitter_verify_{ts}.png", full_page=True)
-                with open(f"/tmp/twitter_verify_{ts}.html", 'w', encoding='utf-8') as f:
-                    f.write(page.content())
-                logger.info("[Twitter] saved verification debug artifacts to /tmp/twitter_verify_%s.(png|html)", ts)
-        except Exception:
-            pass
+        if 'page' in locals() and page:
+            _save_debug_artifacts(page, "twitter_verify")
         try:
             attempt.close()
         finally:
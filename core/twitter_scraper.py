@@ -1,63 +1,60 @@
 import logging
 from typing import List, Tuple, Optional
-import logging
 from datetime import datetime, timezone, timedelta
 
-from playwright.sync_api import sync_playwright
-from .browser_manager import get_managed_browser_page
-from .models import Post
+from .browser_manager import get_managed_browser_page, get_managed_browser_context_with_state, block_heavy_resources
 
 logger = logging.getLogger(__name__)
 
+_CARD_SELECTOR = '[data-testid="cellInnerDiv"], article[data-testid="tweet"]'
+
+
+# Reads every tweet card in one browser round-trip instead of several per card
+_EXTRACT_TWEETS_JS = """() => {
+	let cards = document.querySelectorAll('[data-testid="cellInnerDiv"]');
+	if (!cards.length) cards = document.querySelectorAll('article[data-testid="tweet"]');
+	return Array.from(cards, card => {
+		const text = card.querySelector('div[data-testid="tweetText"]') || card.querySelector('div[lang]');
+		const link = card.querySelector('a[href*="/status/"][role="link"]') || card.querySelector('a[href*="/status/"]');
+		const time = card.querySelector('time');
+		const pinned = Array.from(card.querySelectorAll('[data-testid="socialContext"]'))
+			.some(el => /pinned/i.test(el.innerText));
+		return {
+			content: text ? text.innerText.trim() : '',
+			href: link ? link.getAttribute('href') : null,
+			datetime: time ? time.getAttribute('datetime') : null,
+			pinned,
+		};
+	}).filter(t => t.content && t.href);
+}"""
 
-def _parse_tweet_card(card) -> Optional[Tuple[str, str, datetime, bool]]:
+
+def _parse_tweet_timestamp(iso: Optional[str], fallback: datetime) -> datetime:
 	try:
-		content_el = card.query_selector('div[data-testid="tweetText"]') or card.query_selector('div[lang]')
-		content = content_el.inner_text().strip() if content_el else None
-		# Find status link
-		link_el = card.query_selector('a[href*="/status/"][role="link"]') or card.query_selector('a[href*="/status/"]')
-		href = link_el.get_attribute('href') if link_el else None
-		# Timestamp
-		time_el = card.query_selector('time')
-		created_at = None
-		if time_el:
-			try:
-				iso = time_el.get_attribute('datetime')
-				if iso:
-					created_at = datetime.fromisoformat(iso.replace('Z', '+00:00'))
-			except Exception:
-				created_at = None
-		# Pinned marker
-		pinned = bool(card.query_selector('[data-testid="socialContext"]:has-text("Pinned")'))
-		if not content or not href:
-			return None
-		if href.startswith('/'):
-			href = f"https://x.com{href}"
-		return content, href, created_at or datetime.now(timezone.utc), pinned
-	except Exception:
-		return None
+		if iso:
+			return datetime.fromisoformat(iso.replace('Z', '+00:00'))
+	except ValueError:
+		pass
+	return fallback
 
 
 def _extract_tweets_from_page(page) -> List[Tuple[str, str, datetime, bool]]:
 	try:
-		page.wait_for_selector('[data-testid="cellInnerDiv"], article[data-testid="tweet"]', timeout=30000)
+		page.wait_for_selector(_CARD_SELECTOR, timeout=15000)
 	except Exception:
 		return []
-	# Prefer cell containers; fallback to article
-	cards = page.query_selector_all('[data-testid="cellInnerDiv"]')
-	if not cards:
-		cards = page.query_selector_all('article[data-testid="tweet"]')
 	results: List[Tuple[str, str, datetime, bool]] = []
 	seen = set()
-	for card in cards:
-		parsed = _parse_tweet_card(card)
-		if not parsed:
-			continue
-		content, url, ts, pinned = parsed
+	# Cards without a <time> element are treated as just posted
+	now = datetime.now(timezone.utc)
+	for tweet in page.evaluate(_EXTRACT_TWEETS_JS):
+		url = tweet['href']
+		if url.startswith('/'):
+			url = f"https://x.com{url}"
 		if url in seen:
 			continue
 		seen.add(url)
-		results.append((content, url, ts, pinned))
+		results.append((tweet['content'], url, _parse_tweet_timestamp(tweet['datetime'], now), tweet['pinned']))
 	return results
 
 
@@ -65,30 +62,33 @@ def scrape_twitter_profile(url: str, storage_state: Optional[dict] = None, max_a
 	"""Scrape tweets from a profile, newest-first, skipping pinned and optionally old tweets.
 	Returns list of (content, url, published_at). No DB access here to stay sync-safe.
 	"""
-	cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours) if max_age_hours else None
+	# Backfill keeps everything, so the age cutoff only applies to regular scrapes
+	cutoff = datetime.now(timezone.utc) - timedelta(hours=max_age_hours) if max_age_hours and not backfill else None
 	try:
 		def _run(page):
-			page.set_default_timeout(20000)
+			page.set_default_timeout(15000)
+			# Tweet text, links and timestamps are all we read; skip avatars, media and webfonts
+			block_heavy_resources(page)
 			logger.info("[Twitter] Navigating to profile %s", url)
-			page.goto(url, timeout=60000, wait_until="domcontentloaded")
+			page.goto(url, timeout=25000, wait_until="domcontentloaded")
 			# Detect login wall early
 			if page.query_selector('a[href="/i/flow/login"], input[name="session[username_or_email]"]'):
 				logger.warning("[Twitter] Login wall encountered; session may be missing/expired")
 				return []
-			last_count = 0
+			last_count = page.evaluate(f"document.querySelectorAll('{_CARD_SELECTOR}').length")
 			max_scrolls = 24
 			for _ in range(max_scrolls):
-				page.wait_for_timeout(1000)
 				page.evaluate("window.scrollBy(0, document.body.scrollHeight);")
-				# Allow network to settle
+				# Continue as soon as new cards render; no growth within the timeout means end of feed
 				try:
-					page.wait_for_load_state("networkidle", timeout=5000)
+					handle = page.wait_for_function(
+						f"prev => {{ const n = document.querySelectorAll('{_CARD_SELECTOR}').length; return n > prev ? n : false; }}",
+						arg=last_count,
+						timeout=5000,
+					)
 				except Exception:
-					page.wait_for_timeout(800)
-				cards = page.query_selector_all('[data-testid="cellInnerDiv"], article[data-testid="tweet"]')
-				if cards and len(cards) <= last_count:
 					break
-				last_count = len(cards)
+				last_count = handle.json_value()
 			items = _extract_tweets_from_page(page)
 			logger.info("[Twitter] Extracted %d tweet cards", len(items))
 			# Sort by timestamp desc (newest first)
@@ -97,34 +97,14 @@ def scrape_twitter_profile(url: str, storage_state: Optional[dict] = None, max_a
 			for content, turl, ts, pinned in items:
 				if pinned:
 					continue
-				if cutoff and ts and ts < cutoff and not backfill:
+				if cutoff and ts < cutoff:
 					continue
 				out.append((content, turl, ts))
 			return out
 		if storage_state:
-			pw = sync_playwright().start()
-			browser = pw.chromium.launch(headless=True)
-			context = browser.new_context(
-				storage_state=storage_state,
-				user_agent=(
-					"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-					"AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122 Safari/537.36"
-				),
-				viewport={"width": 1280, "height": 1600},
-			)
-			page = context.new_page()
-			try:
-				return _run(page)
-			finally:
-				try:
-					context.close()
-				except Exception:
-					pass
-				try:
-					browser.close()
-				except Exception:
-					pass
-				pw.stop()
+			# Logged-in session: fresh context on the pooled browser, seeded with the saved cookies
+			with get_managed_browser_context_with_state(storage_state) as context:
+				return _run(context.new_page())
 		else:
 			with get_managed_browser_page() as page:
 				return _run(page)
@@ -0,0 +1,41 @@
+"""Short-lived cache for the singleton configuration rows.
+
+The rows live in the shared (Redis) cache, so every process reads the same
+copy. The cached instances are only for reading: code that saves a config
+should fetch it fresh. Model saves and deletes clear the key through the
+receivers in core.signals. Queryset .update() calls bypass those signals,
+so they must call the matching invalidate_* helper.
+"""
+from django.core.cache import cache
+
+ALERT_SETTINGS_CACHE_KEY = "alertsettings:active"
+TRADING_CONFIG_CACHE_KEY = "tradingconfig:active"
+SETTINGS_CACHE_TTL = 60
+
+
+def get_cached_alert_settings():
+    from core.models import AlertSettings
+
+    return cache.get_or_set(
+        ALERT_SETTINGS_CACHE_KEY,
+        lambda: AlertSettings.objects.order_by("-created_at").first(),
+        SETTINGS_CACHE_TTL,
+    )
+
+
+def get_cached_active_trading_config():
+    from core.models import TradingConfig
+
+    return cache.get_or_set(
+        TRADING_CONFIG_CACHE_KEY,
+        lambda: TradingConfig.objects.filter(is_active=True).first(),
+        SETTINGS_CACHE_TTL,
+    )
+
+
+def invalidate_alert_settings():
+    cache.delete(ALERT_SETTINGS_CACHE_KEY)
+
+
+def invalidate_active_trading_config():
+    cache.delete(TRADING_CONFIG_CACHE_KEY)
@@ -0,0 +1,9 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def build_pooled_session() -> requests.Session:
+    """Session with a keep-alive HTTPS pool, meant to be created once per module and reused."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0))
+    return session
@@ -1,10 +1,15 @@
 import os
-import requests
 import logging
 from typing import Optional
 
+from core.utils.cached_settings import get_cached_alert_settings
+from core.utils.http import build_pooled_session
+
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated sends keep the Telegram connection alive
+_session = build_pooled_session()
+
 
 def get_telegram_config() -> tuple[Optional[str], Optional[str]]:
     token = os.getenv("TELEGRAM_BOT_TOKEN") or os.getenv("TELEGRAM_TOKEN")
@@ -23,7 +28,7 @@ def send_telegram_message(message: str) -> bool:
         return False
     try:
         url = f"https://api.telegram.org/bot{token}/sendMessage"
-        resp = requests.post(url, json={"chat_id": chat_id, "text": message}, timeout=10)
+        resp = _session.post(url, json={"chat_id": chat_id, "text": message}, timeout=10)
         ok = resp.status_code == 200
         logger.info("Telegram response status=%s ok=%s body_prefix=%s", resp.status_code, ok, (resp.text or "")[:120])
         return ok
@@ -44,9 +49,7 @@ ALERT_MAP = {
 
 
 def is_alert_enabled(message_type: str) -> bool:
-    from core.models import AlertSettings
-
-    settings = AlertSettings.objects.order_by("-created_at").first()
+    settings = get_cached_alert_settings()
     if not settings:
         logger.info("No AlertSettings found; alerts disabled for type=%s", message_type)
         return False
@@ -9,13 +9,17 @@ from .tasks import (
     analyze_post,
     execute_trade,
     send_dashboard_update,
+    send_telegram_message_task,
 )
 import logging
 import json
 import os
+from django.db.models import Avg, Count, Max, Q
 from django.utils import timezone
+from django.core.cache import cache
 from datetime import datetime, timedelta
 import requests
+import alpaca_trade_api as tradeapi
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
@@ -24,18 +28,32 @@ from .source_llm import analyze_news_source_with_llm, build_source_kwargs_from_l
 from django.views.decorators.http import require_POST
 from django.contrib import messages
 from .utils.telegram import send_telegram_message
+from .utils.cached_settings import get_cached_active_trading_config
+from .utils.http import build_pooled_session
 from .twitter_login_flow import start_login_flow, complete_login_with_code
 from .twitter_scraper import scrape_twitter_profile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Shared session for the provider health checks; keeps connections alive across dashboard polls
+_session = build_pooled_session()
+
+# Runs the external provider probes concurrently instead of back to back
+_health_check_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="health-check")
+
+# Health results live in the shared (Redis) cache for this many seconds, so all
+# web workers reuse one probe and a manual recheck refreshes it for every process
+_HEALTH_CHECK_TTL = 15
+
 
 @staff_member_required
 def dashboard_view(request):
     logger.info("Dashboard view accessed.")
     # Get bot status for the dashboard
-    trading_config = TradingConfig.objects.filter(is_active=True).first()
+    trading_config = get_cached_active_trading_config()
     bot_enabled = trading_config.bot_enabled if trading_config else False
 
     context = {"bot_enabled": bot_enabled}
@@ -290,8 +308,8 @@ def toggle_bot_status(request):
             logger.info("Bot toggle: considering Telegram alert. status=%s", status)
             if is_alert_enabled("bot_status"):
                 logger.info("Bot toggle: sending Telegram alert")
-                ok = send_telegram_message(f"🤖 Bot {status.upper()}")
-                logger.info("Bot toggle: Telegram sent=%s", ok)
+                send_telegram_message_task.delay(f"🤖 Bot {status.upper()}")
+                logger.info("Bot toggle: Telegram alert queued")
             else:
                 logger.info("Bot toggle: Telegram disabled by settings")
         except Exception as notify_error:
@@ -314,18 +332,20 @@ def toggle_bot_status(request):
 def system_status_api(request):
     """API endpoint to provide comprehensive system status for the dashboard."""
     try:
-        from datetime import timedelta
-        
-        # Get current time
+        # One clock read so every window below shares the same boundaries
         now = timezone.now()
         last_24h = now - timedelta(hours=24)
         last_hour = now - timedelta(hours=1)
 
-        # API Status Checks
+        # API Status Checks: the HTTP probes run in the background while the
+        # ORM-backed news source check stays on the request thread
+        openai_future = _health_check_executor.submit(check_openai_api)
+        alpaca_future = _health_check_executor.submit(check_alpaca_api)
+        news_sources_status = check_news_sources_status()
         api_status = {
-            "openai": check_openai_api(),
-            "news_sources": check_news_sources_status(),
-            "alpaca": check_alpaca_api(),
+            "openai": openai_future.result(),
+            "news_sources": news_sources_status,
+            "alpaca": alpaca_future.result(),
         }
 
         # Get real Alpaca trading data and sync with database
@@ -333,24 +353,43 @@ def system_status_api(request):
         alpaca_positions = alpaca_data.get("positions", [])
         sync_alpaca_positions_to_database(alpaca_positions)
 
-        # System Statistics
+        # System Statistics: one conditional-aggregate query per model
+        source_counts = Source.objects.aggregate(
+            total=Count("id"),
+            active=Count("id", filter=Q(scraping_enabled=True)),
+            last_scraped_at=Max("last_scraped_at"),
+        )
+        post_counts = Post.objects.aggregate(
+            total=Count("id"),
+            h24=Count("id", filter=Q(created_at__gte=last_24h)),
+            h1=Count("id", filter=Q(created_at__gte=last_hour)),
+        )
+        analysis_counts = Analysis.objects.aggregate(
+            total=Count("id"),
+            h24=Count("id", filter=Q(created_at__gte=last_24h)),
+        )
+        trade_counts = Trade.objects.aggregate(
+            total=Count("id"),
+            open=Count("id", filter=Q(status__in=["open", "pending_close"])),  # Synced database count
+            h24=Count("id", filter=Q(created_at__gte=last_24h)),
+            won_24h=Count("id", filter=Q(created_at__gte=last_24h, realized_pnl__gt=0)),
+        )
         stats = {
-            "total_sources": Source.objects.count(),
-            "active_sources": Source.objects.filter(scraping_enabled=True).count(),
-            "total_posts": Post.objects.count(),
-            "posts_24h": Post.objects.filter(created_at__gte=last_24h).count(),
-            "posts_1h": Post.objects.filter(created_at__gte=last_hour).count(),
-            "total_analyses": Analysis.objects.count(),
-            "analyses_24h": Analysis.objects.filter(created_at__gte=last_24h).count(),
-            "total_trades": Trade.objects.count(),
-            "open_trades": Trade.objects.filter(status__in=["open", "pending_close"]).count(),  # Synced database count
-            "trades_24h": Trade.objects.filter(created_at__gte=last_24h).count(),
+            "total_sources": source_counts["total"],
+            "active_sources": source_counts["active"],
+            "total_posts": post_counts["total"],
+            "posts_24h": post_counts["h24"],
+            "posts_1h": post_counts["h1"],
+            "total_analyses": analysis_counts["total"],
+            "analyses_24h": analysis_counts["h24"],
+            "total_trades": trade_counts["total"],
+            "open_trades": trade_counts["open"],
+            "trades_24h": trade_counts["h24"],
         }
 
         # Trading Performance from Alpaca
-        recent_trades = Trade.objects.filter(created_at__gte=last_24h)
-        winning_trades = recent_trades.filter(realized_pnl__gt=0).count()
-        total_recent_trades = recent_trades.count()
+        winning_trades = trade_counts["won_24h"]
+        total_recent_trades = trade_counts["h24"]
         win_rate = (
             (winning_trades / total_recent_trades * 100)
             if total_recent_trades > 0
@@ -362,53 +401,54 @@ def system_status_api(request):
             # Keep existing field name used by the frontend (total_pnl_24h) but populate from live total_pnl
             "total_pnl_24h": round(alpaca_data.get("total_pnl", 0.0), 2),
             "day_pnl": round(alpaca_data.get("day_pnl", 0.0), 2),
-            "avg_confidence": get_avg_confidence(),
+            "avg_confidence": get_avg_confidence(last_24h),
             "account_value": round(alpaca_data.get("account_value", 0.0), 2),
             "buying_power": round(alpaca_data.get("buying_power", 0), 2),
             "alpaca_positions": alpaca_data.get("positions", []),
         }
 
         # Source Status
-        sources_status = []
-        all_sources = Source.objects.all()
+        all_sources = Source.objects.annotate(posts_count=Count("individual_posts")).values(
+            "id",
+            "name",
+            "scraping_enabled",
+            "scraping_status",
+            "last_scraped_at",
+            "error_count",
+            "posts_count",
+        )
         
         # Calculate overall last scrape and next scrape times
-        last_scrape_time = None
+        last_scrape_time = source_counts["last_scraped_at"]
         next_scrape_time = None
         
-        # Find the most recent scrape across all sources
-        recent_scrapes = all_sources.filter(
-            last_scraped_at__isnull=False
-        ).order_by('-last_scraped_at')
-        
-        if recent_scrapes.exists():
-            last_scrape_time = recent_scrapes.first().last_scraped_at
-            
+        if last_scrape_time:
             # Calculate next scrape time based on periodic task (default 5 minutes)
             # We'll use the global 5-minute interval from the periodic task
             next_scrape_time = last_scrape_time + timedelta(minutes=5)
         
-        for source in all_sources:
-            sources_status.append(
-                {
-                    "id": source.id,
-                    "name": source.name,
-                    "enabled": source.scraping_enabled,
-                    "status": source.scraping_status,
-                    "last_scraped": (
-                        source.last_scraped_at.isoformat()
-                        if source.last_scraped_at
-                        else None
-                    ),
-                    "error_count": source.error_count,
-                    "posts_count": source.individual_posts.count(),
-                }
-            )
+        sources_status = [
+            {
+                "id": source["id"],
+                "name": source["name"],
+                "enabled": source["scraping_enabled"],
+                "status": source["scraping_status"],
+                "last_scraped": (
+                    source["last_scraped_at"].isoformat()
+                    if source["last_scraped_at"]
+                    else None
+                ),
+                "error_count": source["error_count"],
+                "posts_count": source["posts_count"],
+            }
+            for source in all_sources
+        ]
 
         # Recent Activity
-        recent_posts = Post.objects.order_by("-created_at")[:5]
+        recent_posts = Post.objects.select_related("source", "analysis").order_by("-created_at")[:5]
         recent_activity = []
         for post in recent_posts:
+            analysis = getattr(post, "analysis", None)
             activity = {
                 "type": "post",
                 "timestamp": post.created_at.isoformat(),
@@ -418,18 +458,18 @@ def system_status_api(request):
                     if len(post.content) > 100
                     else post.content
                 ),
-                "has_analysis": hasattr(post, "analysis"),
+                "has_analysis": analysis is not None,
             }
-            if hasattr(post, "analysis"):
+            if analysis is not None:
                 activity["analysis"] = {
-                    "symbol": post.analysis.symbol,
-                    "direction": post.analysis.direction,
-                    "confidence": post.analysis.confidence,
+                    "symbol": analysis.symbol,
+                    "direction": analysis.direction,
+                    "confidence": analysis.confidence,
                 }
             recent_activity.append(activity)
 
         # Trading Configuration
-        active_config = TradingConfig.objects.filter(is_active=True).first()
+        active_config = get_cached_active_trading_config()
         # Always include trading_config in response so UI can render state
         if active_config:
             config_info = {
@@ -473,6 +513,11 @@ def system_status_api(request):
 
 
 def check_openai_api():
+    """Cached OpenAI health check; see _check_openai_api_uncached."""
+    return cache.get_or_set("health:openai", _check_openai_api_uncached, _HEALTH_CHECK_TTL)
+
+
+def _check_openai_api_uncached():
     """Check if OpenAI API is accessible with real connection test."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -480,10 +525,8 @@ def check_openai_api():
 
     try:
         # Real API test - make a simple request to verify connectivity
-        import requests
-
         headers = {"Authorization": f"Bearer {api_key}"}
-        response = requests.get(
+        response = _session.get(
             "https://api.openai.com/v1/models", headers=headers, timeout=10
         )
 
@@ -512,7 +555,7 @@ def check_newsapi_api():
 
     try:
         # Quick API test
-        response = requests.get(
+        response = _session.get(
             "https://newsapi.org/v2/top-headlines",
             params={"apiKey": api_key, "pageSize": 1, "country": "us"},
             timeout=5,
@@ -525,7 +568,18 @@ def check_newsapi_api():
         return {"status": "warning", "message": f"Connection error: {str(e)}"}
 
 
+@lru_cache(maxsize=4)
+def _get_alpaca_client(api_key, secret_key, base_url):
+    """Alpaca REST client reused across dashboard polls, keyed by credentials."""
+    return tradeapi.REST(api_key, secret_key, base_url=base_url)
+
+
 def check_alpaca_api():
+    """Cached Alpaca health check; see _check_alpaca_api_uncached."""
+    return cache.get_or_set("health:alpaca", _check_alpaca_api_uncached, _HEALTH_CHECK_TTL)
+
+
+def _check_alpaca_api_uncached():
     """Check if Alpaca API is accessible with real connection test using alpaca-py."""
     api_key = os.getenv("ALPACA_API_KEY")
     secret_key = os.getenv("ALPACA_SECRET_KEY")
@@ -536,14 +590,8 @@ def check_alpaca_api():
 
     try:
         # Real API test using alpaca-trade-api
-        import alpaca_trade_api as tradeapi
-
         # Create TradingClient instance
-        trading_client = tradeapi.REST(
-            api_key,
-            secret_key,
-            base_url=base_url
-        )
+        trading_client = _get_alpaca_client(api_key, secret_key, base_url)
 
         # Test connection by getting account information
         account = trading_client.get_account()
@@ -562,8 +610,6 @@ def check_alpaca_api():
         else:
             return {"status": "warning", "message": "Account data incomplete"}
 
-    except ImportError:
-        return {"status": "error", "message": "alpaca-trade-api package not installed"}
     except Exception as e:
         return {"status": "error", "message": f"Connection failed: {str(e)}"}
 
@@ -584,11 +630,7 @@ def get_alpaca_trading_data():
         }
 
     try:
-        import alpaca_trade_api as tradeapi
-
-        trading_client = tradeapi.REST(
-            api_key, secret_key, base_url=base_url
-        )
+        trading_client = _get_alpaca_client(api_key, secret_key, base_url)
 
         # Get account info and open positions from Alpaca
         account = trading_client.get_account()
@@ -670,6 +712,11 @@ def get_alpaca_trading_data():
 
 
 def check_news_sources_status():
+    """Cached news source summary; see _check_news_sources_status_uncached."""
+    return cache.get_or_set("health:news_sources", _check_news_sources_status_uncached, _HEALTH_CHECK_TTL)
+
+
+def _check_news_sources_status_uncached():
     """Check the overall status of all news sources."""
     try:
         total_sources = Source.objects.count()
@@ -711,20 +758,18 @@ def check_news_sources_status():
         return {"status": "error", "message": str(e), "count": 0, "active_count": 0}
 
 
-def get_avg_confidence():
-    """Get average confidence from recent analyses."""
-    last_24h = timezone.now() - timedelta(hours=24)
-    recent_analyses = Analysis.objects.filter(created_at__gte=last_24h)
-    if recent_analyses.exists():
-        total_confidence = sum(a.confidence for a in recent_analyses)
-        return round(total_confidence / recent_analyses.count(), 2)
-    return 0
+def get_avg_confidence(since):
+    """Get average confidence of analyses created at or after `since`."""
+    avg = Analysis.objects.filter(created_at__gte=since).aggregate(avg=Avg("confidence"))["avg"]
+    return round(avg, 2) if avg is not None else 0
 
 
 @staff_member_required
 def check_single_connection(request, service):
     """API endpoint to check connection to a specific service."""
     try:
+        # An explicit recheck always probes the provider and refreshes the shared result
+        cache.delete(f"health:{service}")
         if service == "openai":
             result = check_openai_api()
         elif service == "alpaca":
@@ -872,6 +917,14 @@ def manual_close_trade_view(request):
             trade.alpaca_position = False
         open_trades.append(trade)
 
+    # Only the TP/SL columns are read from the stored trades backing each position
+    tp_sl_fields = (
+        "take_profit_price",
+        "stop_loss_price",
+        "take_profit_price_percentage",
+        "stop_loss_price_percentage",
+    )
+
     # Then add Alpaca positions that aren't pending close
     for pos in alpaca_positions:
         if pos["symbol"] in pending_symbols:
@@ -902,7 +955,11 @@ def manual_close_trade_view(request):
 
                 # Get TP/SL from database if available
                 try:
-                    db_trade = Trade.objects.filter(symbol=self.symbol, status="open").first()
+                    db_trade = (
+                        Trade.objects.filter(symbol=self.symbol, status="open")
+                        .only(*tp_sl_fields, "created_at")
+                        .first()
+                    )
                     if db_trade:
                         self.take_profit_price = db_trade.take_profit_price
                         self.stop_loss_price = db_trade.stop_loss_price
@@ -928,7 +985,7 @@ def manual_close_trade_view(request):
 
                 # Check if we have stored TP/SL settings for this symbol
                 try:
-                    stored_trade = Trade.objects.get(
+                    stored_trade = Trade.objects.only(*tp_sl_fields).get(
                         symbol=self.symbol,
                         status="open",
                         alpaca_order_id=f"position_{self.symbol}",
@@ -1054,7 +1111,6 @@ def manual_close_trade_view(request):
                 try:
                     # Import necessary modules for Alpaca API
                     import os
-                    import alpaca_trade_api as tradeapi
 
                     # Get Alpaca credentials
                     ALPACA_API_KEY = os.getenv("ALPACA_API_KEY")
@@ -1443,7 +1499,6 @@ def manual_close_trade_view(request):
                 # Try to cancel the close order(s) on Alpaca by symbol/side
                 try:
                     import os
-                    import alpaca_trade_api as tradeapi
                     api_key = os.getenv("ALPACA_API_KEY")
                     secret_key = os.getenv("ALPACA_SECRET_KEY")
                     base_url = os.getenv("ALPACA_BASE_URL", "https://paper-api.alpaca.markets")
@@ -1528,7 +1583,7 @@ def manual_close_trade_view(request):
     )
 
     # Get bot status for navbar
-    trading_config = TradingConfig.objects.filter(is_active=True).first()
+    trading_config = get_cached_active_trading_config()
     bot_enabled = trading_config.bot_enabled if trading_config else False
 
     return render(
@@ -1567,7 +1622,7 @@ def test_page_view(request):
             post_id = request.POST.get("post_id")
             if post_id:
                 try:
-                    post = Post.objects.get(id=post_id)
+                    post = Post.objects.only("id").get(id=post_id)
                     analyze_post.delay(post.id)
                     logger.info(
                         f"Manually triggered analyze_post task for Post ID: {post_id}."
@@ -1580,7 +1635,7 @@ def test_page_view(request):
             analysis_id = request.POST.get("analysis_id")
             if analysis_id:
                 try:
-                    analysis = Analysis.objects.get(id=analysis_id)
+                    analysis = Analysis.objects.only("id").get(id=analysis_id)
                     execute_trade.delay(analysis.id)
                     logger.info(
                         f"Manually triggered execute_trade task for Analysis ID: {analysis_id}."
@@ -1656,7 +1711,7 @@ def test_page_view(request):
     sources = Source.objects.all()  # Fetch all sources
 
     # Get bot status for display in menu
-    trading_config = TradingConfig.objects.filter(is_active=True).first()
+    trading_config = get_cached_active_trading_config()
     bot_enabled = trading_config.bot_enabled if trading_config else False
 
     return render(
@@ -1844,7 +1899,7 @@ def alerts_view(request):
             messages.error(request, f"Failed to save: {e}")
 
     # Pass bot status for navbar and current settings
-    trading_config = TradingConfig.objects.filter(is_active=True).first()
+    trading_config = get_cached_active_trading_config()
     bot_enabled = trading_config.bot_enabled if trading_config else False
 
     return render(
@@ -1998,7 +2053,6 @@ def cancel_trade_api(request):
             
             # Cancel the trade via Alpaca API
             try:
-                import alpaca_trade_api as tradeapi
                 import os
                 
                 api_key = os.getenv("ALPACA_API_KEY")
@@ -2051,7 +2105,6 @@ def trade_status_api(request, trade_id):
             
             # Get status from Alpaca API
             try:
-                import alpaca_trade_api as tradeapi
                 import os
                 
                 api_key = os.getenv("ALPACA_API_KEY")
@@ -2219,7 +2272,7 @@ def analyze_source_page(request):
     Render the source analysis page
     """
     # Provide bot status for navbar indicator
-    trading_config = TradingConfig.objects.filter(is_active=True).first()
+    trading_config = get_cached_active_trading_config()
     bot_enabled = trading_config.bot_enabled if trading_config else False
 
     return render(
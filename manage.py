@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'news_trader.settings')
+    # Tests default to the in-memory SQLite settings; --settings still overrides this
+    default_settings = 'news_trader.test_settings' if sys.argv[1:2] == ['test'] else 'news_trader.settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', default_settings)
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -139,6 +139,15 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Shared cache so web, Celery workers and the Telegram bot see the same cached
+# settings and health checks (and the same invalidations)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CACHE_URL', CELERY_BROKER_URL),
+    }
+}
+
 # API Keys from environment variables
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 ALPACA_API_KEY = os.getenv('ALPACA_API_KEY')
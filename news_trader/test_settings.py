@@ -56,6 +56,9 @@ PASSWORD_HASHERS = [
 # Don't use Celery during tests
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+# Keep anything that still reaches Celery off Redis
+CELERY_BROKER_URL = "memory://"
+CELERY_RESULT_BACKEND = "cache+memory://"
 
 # Test-specific settings
 SECRET_KEY = "test-secret-key"